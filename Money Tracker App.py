@@ -1,107 +1,157 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
-import json
+import math
+import mmap
+import os
+import sys
+import time
 from pathlib import Path
-from abc import ABC, abstractmethod
+
+try:
+    import orjson
+except ImportError:  # Fallback ke json standar jika orjson tidak terpasang
+    orjson = None
+    import json
+
+
+# Cache tanggal terformat per menit: [menit epoch, string]
+_WAKTU_CACHE = [None, ""]
+
+
+def _waktu_sekarang():
+    """Tanggal-waktu saat ini ("%Y-%m-%d %H:%M"), diformat ulang sekali per menit"""
+    menit = int(time.time() // 60)
+    if menit != _WAKTU_CACHE[0]:
+        _WAKTU_CACHE[0] = menit
+        _WAKTU_CACHE[1] = time.strftime("%Y-%m-%d %H:%M")
+    return _WAKTU_CACHE[1]
+
+
+# Batas jumlah: integer 64-bit, batas yang bisa di-encode orjson
+_JUMLAH_MAKS = 2**63 - 1
+
+
+def _ke_rupiah(value):
+    """Bulatkan jumlah ke rupiah (int); nilai non-finite atau terlalu besar ditolak"""
+    if not math.isfinite(value):
+        raise ValueError("Jumlah harus berupa angka yang valid")
+    value = int(round(value))
+    if abs(value) > _JUMLAH_MAKS:
+        raise ValueError("Jumlah terlalu besar")
+    return value
 
 
 # =========================
 # ENCAPSULATION & INHERITANCE
 # =========================
 
-class BaseTransaction(ABC):
-    """Base class abstrak untuk semua jenis transaksi (Encapsulation & Inheritance)"""
+class BaseTransaction:
+    """Base class untuk semua jenis transaksi (Encapsulation & Inheritance)
+
+    Class biasa tanpa ABCMeta agar instansiasi tidak melewati metaclass;
+    tidak boleh diinstansiasi langsung, gunakan Pengeluaran/Pemasukan.
+    """
+    
+    # Tag tipe sebagai integer untuk percabangan cepat di agregasi
+    TIPE_PENGELUARAN = 0
+    TIPE_PEMASUKAN = 1
+    
+    # Konstanta per class, di-override oleh child class
+    ICON = None
+    TIPE = None
+    TANDA = None  # Arah dampak ke saldo: +1 menambah, -1 mengurangi
+    tipe = None  # Nama tipe untuk penyimpanan & tampilan
+    
+    # __slots__: atribut disimpan di slot tetap (tanpa __dict__ per instance)
+    __slots__ = (
+        'kategori', 'jumlah', 'keterangan', 'tanggal',
+        '_currency_str', '_display_name', '_row'
+    )
     
     def __init__(self, kategori, jumlah, keterangan, tanggal=None):
-        # Private attributes (Encapsulation dengan name mangling)
-        self.__kategori = kategori
-        self.__jumlah = jumlah
-        self.__keterangan = keterangan
-        self.__tanggal = tanggal if tanggal else datetime.now().strftime("%Y-%m-%d %H:%M")
-        self._tipe = None  # Protected attribute
-    
-    # Getter methods (Encapsulation)
-    @property
-    def kategori(self):
-        return self.__kategori
-    
-    @property
-    def jumlah(self):
-        return self.__jumlah
-    
-    @property
-    def keterangan(self):
-        return self.__keterangan
-    
-    @property
-    def tanggal(self):
-        return self.__tanggal
-    
-    @property
-    def tipe(self):
-        return self._tipe
+        if type(self) is BaseTransaction:
+            raise TypeError("BaseTransaction tidak dapat diinstansiasi langsung")
+        # Intern: transaksi dengan kategori sama berbagi satu objek string
+        self.kategori = sys.intern(kategori)
+        self.jumlah = _ke_rupiah(jumlah)  # Rupiah bulat
+        self.keterangan = keterangan
+        self.tanggal = tanggal if tanggal else _waktu_sekarang()
+        self._display_name = None  # Protected, diisi oleh child class
+        # Cache string tampilan (jumlah hanya berubah lewat set_jumlah)
+        self._currency_str = f"Rp {self.jumlah:,}"
+        self._row = None  # Cache baris Treeview, dibuat saat pertama dirender
     
     # Setter methods (Encapsulation dengan validasi)
-    @jumlah.setter
-    def jumlah(self, value):
+    def set_jumlah(self, value):
+        value = _ke_rupiah(value)
         if value <= 0:
             raise ValueError("Jumlah harus lebih dari 0")
-        self.__jumlah = value
+        self.jumlah = value
+        self._currency_str = f"Rp {value:,}"
+        self._row = None
     
-    @keterangan.setter
-    def keterangan(self, value):
-        self.__keterangan = value if value else "-"
+    def set_keterangan(self, value):
+        self.keterangan = value if value else "-"
+        self._row = None
     
-    # Abstract method (akan di-override di child class - Polymorphism)
-    @abstractmethod
+    # Polymorphism: nilai berbeda lewat konstanta/atribut yang diisi child class
     def get_icon(self):
         """Mengembalikan icon untuk tipe transaksi"""
-        pass
+        return self.ICON
     
-    @abstractmethod
     def get_display_name(self):
         """Mengembalikan nama tampilan untuk tipe transaksi"""
-        pass
+        return self._display_name
     
-    # Method untuk mengkalkulasi dampak transaksi (akan di-override - Polymorphism)
-    @abstractmethod
+    # Dampak berbeda per child class lewat konstanta TANDA (Polymorphism)
     def calculate_impact(self):
         """Mengembalikan dampak transaksi terhadap saldo (+ atau -)"""
-        pass
+        return self.TANDA * self.jumlah
     
     def to_dict(self):
         """Konversi ke dictionary untuk penyimpanan"""
         return {
-            'kategori': self.__kategori,
-            'jumlah': self.__jumlah,
-            'keterangan': self.__keterangan,
-            'tipe': self._tipe,
-            'tanggal': self.__tanggal
+            'kategori': self.kategori,
+            'jumlah': self.jumlah,
+            'keterangan': self.keterangan,
+            'tipe': self.tipe,
+            'tanggal': self.tanggal
         }
     
+    def to_record(self):
+        """Konversi ke record ringkas (urutan field = argumen create_transaction)"""
+        return (self.tipe, self.kategori, self.jumlah, self.keterangan, self.tanggal)
+    
     def format_currency(self):
-        """Format jumlah ke format mata uang"""
-        return f"Rp {self.__jumlah:,.0f}"
+        """Format jumlah ke format mata uang (cached)"""
+        return self._currency_str
+    
+    def get_row(self):
+        """Tuple nilai kolom Treeview (cached, di-reset oleh setter)"""
+        if self._row is None:
+            # Polymorphism: get_display_name() berbeda untuk Pemasukan dan Pengeluaran
+            self._row = (
+                self.tanggal,
+                self.get_display_name(),
+                self.kategori,
+                self._currency_str,
+                self.keterangan
+            )
+        return self._row
 
 
 class Pengeluaran(BaseTransaction):
     """Class untuk transaksi pengeluaran (Inheritance dari BaseTransaction)"""
     
+    __slots__ = ()
+    ICON = '💸'
+    TIPE = BaseTransaction.TIPE_PENGELUARAN
+    TANDA = -1  # Pengeluaran mengurangi saldo
+    tipe = 'pengeluaran'
+    
     def __init__(self, kategori, jumlah, keterangan, tanggal=None):
         super().__init__(kategori, jumlah, keterangan, tanggal)
-        self._tipe = 'pengeluaran'
-    
-    # Polymorphism - Override method dari parent class
-    def get_icon(self):
-        return '💸'
-    
-    def get_display_name(self):
-        return f"{self.get_icon()} Pengeluaran"
-    
-    def calculate_impact(self):
-        """Pengeluaran mengurangi saldo"""
-        return -self.jumlah
+        self._display_name = f"{self.ICON} Pengeluaran"
     
     def is_over_budget(self, budget_limit):
         """Method khusus untuk pengeluaran - mengecek apakah melebihi budget"""
@@ -111,20 +161,15 @@ class Pengeluaran(BaseTransaction):
 class Pemasukan(BaseTransaction):
     """Class untuk transaksi pemasukan (Inheritance dari BaseTransaction)"""
     
+    __slots__ = ()
+    ICON = '💰'
+    TIPE = BaseTransaction.TIPE_PEMASUKAN
+    TANDA = 1  # Pemasukan menambah saldo
+    tipe = 'pemasukan'
+    
     def __init__(self, kategori, jumlah, keterangan, tanggal=None):
         super().__init__(kategori, jumlah, keterangan, tanggal)
-        self._tipe = 'pemasukan'
-    
-    # Polymorphism - Override method dari parent class dengan behavior berbeda
-    def get_icon(self):
-        return '💰'
-    
-    def get_display_name(self):
-        return f"{self.get_icon()} Pemasukan"
-    
-    def calculate_impact(self):
-        """Pemasukan menambah saldo"""
-        return self.jumlah
+        self._display_name = f"{self.ICON} Pemasukan"
     
     def calculate_tax(self, tax_rate=0.05):
         """Method khusus untuk pemasukan - menghitung pajak"""
@@ -138,15 +183,20 @@ class Pemasukan(BaseTransaction):
 class TransactionFactory:
     """Factory class untuk membuat objek transaksi (Encapsulation & Design Pattern)"""
     
+    # Registry tipe -> class (dispatch dengan satu lookup dict)
+    __KELAS = {
+        'pengeluaran': Pengeluaran,
+        'pemasukan': Pemasukan
+    }
+    
     @staticmethod
     def create_transaction(tipe, kategori, jumlah, keterangan, tanggal=None):
         """Factory method untuk membuat transaksi berdasarkan tipe"""
-        if tipe == 'pengeluaran':
-            return Pengeluaran(kategori, jumlah, keterangan, tanggal)
-        elif tipe == 'pemasukan':
-            return Pemasukan(kategori, jumlah, keterangan, tanggal)
-        else:
-            raise ValueError(f"Tipe transaksi tidak valid: {tipe}")
+        try:
+            kelas = TransactionFactory.__KELAS[tipe]
+        except KeyError:
+            raise ValueError(f"Tipe transaksi tidak valid: {tipe}") from None
+        return kelas(kategori, jumlah, keterangan, tanggal)
     
     @staticmethod
     def from_dict(data):
@@ -158,6 +208,11 @@ class TransactionFactory:
             data['keterangan'],
             data['tanggal']
         )
+    
+    @staticmethod
+    def from_record(record):
+        """Factory method untuk membuat transaksi dari record ringkas"""
+        return TransactionFactory.create_transaction(*record)
 
 
 # =========================
@@ -165,32 +220,160 @@ class TransactionFactory:
 # =========================
 
 class DataManager:
-    """Class untuk mengelola penyimpanan data (Encapsulation)"""
-    
-    def __init__(self, filename='money_tracker_data.json'):
+    """Class untuk mengelola penyimpanan data (Encapsulation)
+
+    Data disimpan dalam format JSON-Lines append-only: setiap transaksi baru
+    ditambahkan sebagai satu baris, penghapusan dicatat sebagai baris
+    tombstone, dan file ditulis ulang (kompaksi) hanya sesekali.
+    Setiap baris berupa array posisional tanpa nama field, yaitu
+    [tipe, kategori, jumlah, keterangan, tanggal] atau ["delete", index].
+    Record baru ditampung di buffer dan baru ditulis ke file saat flush().
+    Jika file tidak bisa dibaca utuh, DataManager menjadi read-only agar
+    file tidak ditimpa oleh riwayat yang tidak lengkap.
+    """
+    
+    __BATAS_KOMPAKSI = 50  # Jumlah tombstone sebelum file ditulis ulang
+    __OP_HAPUS = 'delete'
+    
+    def __init__(self, filename='money_tracker_data.jsonl'):
         self.__filename = filename  # Private attribute
+        self.__jumlah_hapus = 0
+        self.__pending = []  # Record yang belum ditulis ke file
+        self.__read_only = False
+    
+    @staticmethod
+    def __encode(data):
+        """Serialisasi satu record menjadi satu baris bytes"""
+        if orjson is not None:
+            return orjson.dumps(data) + b'\n'
+        return (json.dumps(data) + '\n').encode('utf-8')
+    
+    @staticmethod
+    def __decode(baris):
+        """Deserialisasi satu baris bytes menjadi record"""
+        if orjson is not None:
+            return orjson.loads(baris)
+        return json.loads(baris)
+    
+    def is_read_only(self):
+        """True jika file data rusak dan perubahan tidak akan disimpan"""
+        return self.__read_only
+    
+    def __append(self, data):
+        """Menampung satu record untuk ditulis pada flush() berikutnya"""
+        self.__pending.append(self.__encode(data))
+    
+    def flush(self):
+        """Menulis semua record di buffer ke akhir file dalam satu kali tulis"""
+        if self.__read_only:
+            return False
+        if not self.__pending:
+            return True
+        try:
+            with open(self.__filename, 'ab') as f:
+                f.writelines(self.__pending)
+            self.__pending.clear()
+            return True
+        except Exception as e:
+            print(f"Error menyimpan data: {e}")
+            return False
     
     def simpan_data(self, transaksi_list):
-        """Menyimpan data ke file JSON"""
-        data = [t.to_dict() for t in transaksi_list]
+        """Menulis ulang seluruh data ke file JSON-Lines (kompaksi)"""
+        if self.__read_only:
+            return False
         try:
-            with open(self.__filename, 'w') as f:
-                json.dump(data, f, indent=2)
+            Path(self.__filename).write_bytes(
+                b''.join([self.__encode(t.to_record()) for t in transaksi_list])
+            )
+            self.__jumlah_hapus = 0
+            self.__pending.clear()  # Sudah termasuk dalam transaksi_list
             return True
         except Exception as e:
             print(f"Error menyimpan data: {e}")
             return False
     
+    def append_transaction(self, transaksi):
+        """Menyimpan satu transaksi baru tanpa menulis ulang seluruh file"""
+        self.__append(transaksi.to_record())
+    
+    def hapus_transaksi(self, index, transaksi_list):
+        """Mencatat penghapusan transaksi ke-index (transaksi_list sudah diperbarui)"""
+        self.__jumlah_hapus += 1
+        if self.__jumlah_hapus > self.__BATAS_KOMPAKSI and self.simpan_data(transaksi_list):
+            return  # Kompaksi berhasil, tombstone tidak diperlukan
+        # Tanpa kompaksi (atau kompaksi gagal): penghapusan tetap dicatat
+        self.__append((self.__OP_HAPUS, index))
+    
     def muat_data(self):
-        """Memuat data dari file JSON"""
+        """Memuat data dari file JSON-Lines dengan me-replay semua record
+
+        File di-mmap dan dibaca per baris, sehingga isi file tidak pernah
+        disalin utuh ke memori Python. Baris terakhir tanpa newline yang
+        tidak bisa dibaca (mis. aplikasi mati saat menulis) dibuang dari file.
+        Baris rusak lainnya menghentikan replay: karena tombstone bersifat
+        posisional, melewatinya akan menghapus record yang salah. Riwayat
+        sampai baris tersebut tetap ditampilkan, tetapi DataManager menjadi
+        read-only.
+        """
+        transaksi_list = []
         try:
-            if Path(self.__filename).exists():
-                with open(self.__filename, 'r') as f:
-                    data = json.load(f)
-                return [TransactionFactory.from_dict(t) for t in data]
+            try:
+                f = open(self.__filename, 'rb')
+            except FileNotFoundError:
+                return self.__muat_legacy()
+            
+            potong = None  # Offset awal baris terakhir yang terpotong
+            tanpa_newline = False
+            with f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return transaksi_list  # mmap tidak bisa untuk file kosong
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    while True:
+                        awal = mm.tell()
+                        baris = mm.readline()
+                        if not baris:
+                            break
+                        if not baris.strip():
+                            continue
+                        try:
+                            self.__replay(self.__decode(baris), transaksi_list)
+                        except (ValueError, TypeError, LookupError) as e:
+                            if mm.tell() == mm.size() and not baris.endswith(b'\n'):
+                                potong = awal  # Baris terakhir terpotong
+                                break
+                            raise ValueError(f"baris rusak pada offset {awal}: {e!r}") from e
+                        tanpa_newline = not baris.endswith(b'\n')
+            
+            # Pastikan append berikutnya dimulai di awal baris baru
+            if potong is not None:
+                os.truncate(self.__filename, potong)
+            elif tanpa_newline:
+                with open(self.__filename, 'ab') as f:
+                    f.write(b'\n')
+            return transaksi_list
         except Exception as e:
             print(f"Error memuat data: {e}")
-        return []
+            self.__read_only = True
+        return transaksi_list
+    
+    def __replay(self, record, transaksi_list):
+        """Menerapkan satu record (transaksi atau tombstone) ke transaksi_list"""
+        if record[0] == self.__OP_HAPUS:
+            del transaksi_list[record[1]]
+            self.__jumlah_hapus += 1
+        else:
+            transaksi_list.append(TransactionFactory.from_record(record))
+    
+    def __muat_legacy(self):
+        """Migrasi dari format lama (satu dokumen JSON) jika ada"""
+        try:
+            raw = Path(self.__filename).with_suffix('.json').read_bytes()
+        except FileNotFoundError:
+            return []
+        transaksi_list = [TransactionFactory.from_dict(t) for t in self.__decode(raw)]
+        self.simpan_data(transaksi_list)
+        return transaksi_list
 
 
 # =========================
@@ -198,31 +381,60 @@ class DataManager:
 # =========================
 
 class FinancialCalculator:
-    """Class untuk melakukan kalkulasi keuangan (Encapsulation & Single Responsibility)"""
+    """Class untuk melakukan kalkulasi keuangan (Encapsulation & Single Responsibility)
+
+    Total disimpan sebagai running totals: dihitung penuh sekali dari
+    transaksi_list awal, lalu diperbarui lewat add()/remove().
+    """
     
     def __init__(self, transaksi_list):
-        self.__transaksi_list = transaksi_list
+        self.__total_in = 0
+        self.__total_out = 0
+        self.__saldo = 0
+        self.__hitung_ulang(transaksi_list)
+    
+    def __hitung_ulang(self, transaksi_list):
+        """Menghitung ulang semua total dalam satu kali iterasi"""
+        total_in = total_out = 0
+        pemasukan = BaseTransaction.TIPE_PEMASUKAN
+        for t in transaksi_list:
+            jumlah = t.jumlah
+            if t.TIPE == pemasukan:
+                total_in += jumlah
+            else:
+                total_out += jumlah
+        self.__total_in = total_in
+        self.__total_out = total_out
+        self.__saldo = total_in - total_out
+    
+    def add(self, transaksi):
+        """Memperbarui total saat transaksi ditambahkan"""
+        if transaksi.TIPE == BaseTransaction.TIPE_PEMASUKAN:
+            self.__total_in += transaksi.jumlah
+        else:
+            self.__total_out += transaksi.jumlah
+        # Polymorphism: calculate_impact() bertanda sesuai jenis transaksi
+        self.__saldo += transaksi.calculate_impact()
+    
+    def remove(self, transaksi):
+        """Memperbarui total saat transaksi dihapus"""
+        if transaksi.TIPE == BaseTransaction.TIPE_PEMASUKAN:
+            self.__total_in -= transaksi.jumlah
+        else:
+            self.__total_out -= transaksi.jumlah
+        self.__saldo -= transaksi.calculate_impact()
     
     def hitung_total_pemasukan(self):
-        """Menghitung total pemasukan menggunakan polymorphism"""
-        return sum(
-            t.calculate_impact() 
-            for t in self.__transaksi_list 
-            if isinstance(t, Pemasukan)
-        )
+        """Mengembalikan total pemasukan"""
+        return self.__total_in
     
     def hitung_total_pengeluaran(self):
-        """Menghitung total pengeluaran (nilai absolut)"""
-        return abs(sum(
-            t.calculate_impact() 
-            for t in self.__transaksi_list 
-            if isinstance(t, Pengeluaran)
-        ))
+        """Mengembalikan total pengeluaran (nilai absolut)"""
+        return self.__total_out
     
     def hitung_saldo(self):
-        """Menghitung saldo menggunakan polymorphism"""
-        # Demonstrasi polymorphism: setiap transaksi punya calculate_impact() berbeda
-        return sum(t.calculate_impact() for t in self.__transaksi_list)
+        """Mengembalikan saldo (jumlah dampak semua transaksi)"""
+        return self.__saldo
     
     def get_statistik(self):
         """Mendapatkan statistik lengkap"""
@@ -240,8 +452,8 @@ class FinancialCalculator:
 class UIManager:
     """Class untuk mengelola komponen UI (Encapsulation & Separation of Concerns)"""
     
-    # Class variables (Encapsulation di level class)
-    __KATEGORI_PENGELUARAN = [
+    # Class variables (Encapsulation di level class, tuple agar immutable)
+    __KATEGORI_PENGELUARAN = (
         "🍔 Makanan & Minuman",
         "🚗 Transportasi",
         "🎮 Entertainment",
@@ -251,51 +463,83 @@ class UIManager:
         "📚 Pendidikan",
         "🏠 Kos/Sewa",
         "💳 Lainnya"
-    ]
+    )
     
-    __KATEGORI_PEMASUKAN = [
+    __KATEGORI_PEMASUKAN = (
         "💰 Gaji/Uang Jajan",
         "💼 Freelance",
         "🛍️ Jualan Online",
         "🎁 Hadiah/Bonus",
         "💵 Lainnya"
-    ]
+    )
+    
+    # Font yang dipakai berulang (dibuat sekali, bukan per widget)
+    FONT_FORM = ('Arial', 10)
+    FONT_GROUP = ('Arial', 12, 'bold')
+    
+    # Warna summary card yang style ttk-nya sudah didaftarkan
+    __WARNA_TERDAFTAR = set()
+    
+    # Opsi bersama tombol aksi (tk.Button agar warna tetap sama di semua theme)
+    __OPSI_TOMBOL = {
+        'fg': 'white',
+        'font': ('Arial', 11, 'bold'),
+        'padx': 20,
+        'pady': 8,
+        'cursor': 'hand2'
+    }
     
     @classmethod
     def get_kategori_pengeluaran(cls):
         """Getter untuk kategori pengeluaran (Encapsulation)"""
-        return cls.__KATEGORI_PENGELUARAN.copy()
+        return cls.__KATEGORI_PENGELUARAN
     
     @classmethod
     def get_kategori_pemasukan(cls):
         """Getter untuk kategori pemasukan (Encapsulation)"""
-        return cls.__KATEGORI_PEMASUKAN.copy()
+        return cls.__KATEGORI_PEMASUKAN
     
     @staticmethod
-    def create_summary_card(parent, title, color):
+    def setup_styles():
+        """Mendaftarkan named style ttk sekali untuk seluruh aplikasi"""
+        style = ttk.Style()
+        
+        style.configure('Header.TLabel', font=('Arial', 24, 'bold'), background='#4CAF50', foreground='white')
+        style.configure('Form.TLabel', font=UIManager.FONT_FORM, background='white')
+        style.configure('CardTitle.TLabel', font=('Arial', 9, 'bold'), foreground='white')
+        style.configure('CardValue.TLabel', font=('Arial', 14, 'bold'), foreground='white')
+    
+    @classmethod
+    def __style_card(cls, color):
+        """Daftarkan style card untuk satu warna (sekali per warna), kembalikan prefix-nya"""
+        prefix = color.lstrip('#')
+        if color not in cls.__WARNA_TERDAFTAR:
+            # Style turunan mewarisi font dari CardTitle/CardValue
+            style = ttk.Style()
+            style.configure(f'{prefix}.CardTitle.TLabel', background=color)
+            style.configure(f'{prefix}.CardValue.TLabel', background=color)
+            cls.__WARNA_TERDAFTAR.add(color)
+        return prefix
+    
+    @classmethod
+    def create_summary_card(cls, parent, title, color):
         """Factory method untuk membuat summary card"""
         card = tk.Frame(parent, bg=color, width=150, height=80)
         card.pack_propagate(False)
         
-        tk.Label(
-            card,
-            text=title,
-            bg=color,
-            fg='white',
-            font=('Arial', 9, 'bold')
-        ).pack(pady=(10, 5))
-        
-        label = tk.Label(
-            card,
-            text="Rp 0",
-            bg=color,
-            fg='white',
-            font=('Arial', 14, 'bold')
-        )
+        prefix = cls.__style_card(color)
+        ttk.Label(card, text=title, style=f'{prefix}.CardTitle.TLabel').pack(pady=(10, 5))
+        
+        label = ttk.Label(card, text="Rp 0", style=f'{prefix}.CardValue.TLabel')
         label.pack()
         
         card.label = label
         return card
+    
+    @classmethod
+    def create_action_button(cls, parent, text, command, color):
+        """Factory method untuk membuat tombol aksi berwarna"""
+        return tk.Button(parent, text=text, command=command, bg=color, **cls.__OPSI_TOMBOL)
 
 
 # =========================
@@ -311,29 +555,43 @@ class MoneyTrackerApp:
         self.__root.geometry("1200x600")
         self.__root.resizable(False, False)
         self.__root.configure(bg='#f0f0f0')
+        self.__root.protocol("WM_DELETE_WINDOW", self.__on_close)
         
         # Composition: Menggunakan object dari class lain (Encapsulation)
         self.__data_manager = DataManager()
         self.__transaksi_list = self.__data_manager.muat_data()
         self.__calculator = FinancialCalculator(self.__transaksi_list)
+        self.__save_scheduled = None  # ID timer after() untuk flush ke file
+        
+        # Virtualisasi Treeview: posisi baris teratas (0 = transaksi terbaru)
+        self.__view_start = 0
+        self.__terpilih = None  # iid (index list) baris terpilih, bertahan saat scroll
+        self.__baris_tampil = 15  # Diukur ulang dari tinggi Treeview (<Configure>)
         
         # Setup UI
         self.__setup_ui()
         self.__update_display()
+        
+        if self.__data_manager.is_read_only():
+            messagebox.showwarning(
+                "Peringatan",
+                "File data rusak dan hanya dimuat sebagian.\n"
+                "Perubahan tidak akan disimpan sampai file diperbaiki."
+            )
     
     def __setup_ui(self):
         """Setup UI - Private method (Encapsulation)"""
+        UIManager.setup_styles()
+        
         # Header
         header_frame = tk.Frame(self.__root, bg='#4CAF50', height=80)
         header_frame.pack(fill='x')
         header_frame.pack_propagate(False)
         
-        tk.Label(
+        ttk.Label(
             header_frame,
             text="💰 Manajemen Keuangan",
-            font=('Arial', 24, 'bold'),
-            bg='#4CAF50',
-            fg='white'
+            style='Header.TLabel'
         ).pack(pady=20)
         
         # Main container
@@ -349,7 +607,7 @@ class MoneyTrackerApp:
         input_frame = tk.LabelFrame(
             parent,
             text="📝 Tambah Transaksi",
-            font=('Arial', 12, 'bold'),
+            font=UIManager.FONT_GROUP,
             bg='white',
             padx=15,
             pady=15
@@ -357,7 +615,7 @@ class MoneyTrackerApp:
         input_frame.grid(row=0, column=0, sticky='nsew', padx=(0, 10))
         
         # Tipe transaksi
-        tk.Label(input_frame, text="Tipe:", bg='white', font=('Arial', 10)).grid(row=0, column=0, sticky='w', pady=5)
+        ttk.Label(input_frame, text="Tipe:", style='Form.TLabel').grid(row=0, column=0, sticky='w', pady=5)
         self.__tipe_var = tk.StringVar(value='pengeluaran')
         
         tipe_frame = tk.Frame(input_frame, bg='white')
@@ -382,47 +640,31 @@ class MoneyTrackerApp:
         ).pack(side='left', padx=5)
         
         # Kategori
-        tk.Label(input_frame, text="Kategori:", bg='white', font=('Arial', 10)).grid(row=1, column=0, sticky='w', pady=5)
+        ttk.Label(input_frame, text="Kategori:", style='Form.TLabel').grid(row=1, column=0, sticky='w', pady=5)
         self.__kategori_combo = ttk.Combobox(input_frame, width=25, state='readonly')
         self.__kategori_combo.grid(row=1, column=1, sticky='w', pady=5)
         self.__update_kategori_list()
         
         # Jumlah
-        tk.Label(input_frame, text="Jumlah (Rp):", bg='white', font=('Arial', 10)).grid(row=2, column=0, sticky='w', pady=5)
-        self.__jumlah_entry = tk.Entry(input_frame, width=27, font=('Arial', 10))
+        ttk.Label(input_frame, text="Jumlah (Rp):", style='Form.TLabel').grid(row=2, column=0, sticky='w', pady=5)
+        self.__jumlah_entry = tk.Entry(input_frame, width=27, font=UIManager.FONT_FORM)
         self.__jumlah_entry.grid(row=2, column=1, sticky='w', pady=5)
         
         # Keterangan
-        tk.Label(input_frame, text="Keterangan:", bg='white', font=('Arial', 10)).grid(row=3, column=0, sticky='w', pady=5)
-        self.__keterangan_entry = tk.Entry(input_frame, width=27, font=('Arial', 10))
+        ttk.Label(input_frame, text="Keterangan:", style='Form.TLabel').grid(row=3, column=0, sticky='w', pady=5)
+        self.__keterangan_entry = tk.Entry(input_frame, width=27, font=UIManager.FONT_FORM)
         self.__keterangan_entry.grid(row=3, column=1, sticky='w', pady=5)
         
         # Tombol
         btn_frame = tk.Frame(input_frame, bg='white')
         btn_frame.grid(row=4, column=0, columnspan=2, pady=20)
         
-        tk.Button(
-            btn_frame,
-            text="✅ Tambah",
-            command=self.__tambah_transaksi,
-            bg='#4CAF50',
-            fg='white',
-            font=('Arial', 11, 'bold'),
-            padx=20,
-            pady=8,
-            cursor='hand2'
+        UIManager.create_action_button(
+            btn_frame, "✅ Tambah", self.__tambah_transaksi, '#4CAF50'
         ).pack(side='left', padx=5)
         
-        tk.Button(
-            btn_frame,
-            text="🗑️ Hapus Terpilih",
-            command=self.__hapus_transaksi,
-            bg='#f44336',
-            fg='white',
-            font=('Arial', 11, 'bold'),
-            padx=20,
-            pady=8,
-            cursor='hand2'
+        UIManager.create_action_button(
+            btn_frame, "🗑️ Hapus Terpilih", self.__hapus_transaksi, '#f44336'
         ).pack(side='left', padx=5)
     
     def __setup_display_panel(self, parent):
@@ -453,7 +695,7 @@ class MoneyTrackerApp:
         list_frame = tk.LabelFrame(
             display_frame,
             text="📜 Riwayat Transaksi",
-            font=('Arial', 12, 'bold'),
+            font=UIManager.FONT_GROUP,
             bg='white',
             padx=10,
             pady=10
@@ -462,7 +704,7 @@ class MoneyTrackerApp:
         
         # Treeview
         columns = ('Tanggal', 'Tipe', 'Kategori', 'Jumlah', 'Keterangan')
-        self.__tree = ttk.Treeview(list_frame, columns=columns, show='headings', height=15)
+        self.__tree = ttk.Treeview(list_frame, columns=columns, show='headings', height=self.__baris_tampil)
         
         self.__tree.heading('Tanggal', text='Tanggal')
         self.__tree.heading('Tipe', text='Tipe')
@@ -476,15 +718,29 @@ class MoneyTrackerApp:
         self.__tree.column('Jumlah', width=100)
         self.__tree.column('Keterangan', width=150)
         
-        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.__tree.yview)
-        self.__tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar & mouse wheel menggeser jendela data, bukan Treeview
+        self.__scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.__on_scroll)
+        self.__tree.bind('<MouseWheel>', self.__on_mousewheel)
+        self.__tree.bind('<Button-4>', self.__on_mousewheel)
+        self.__tree.bind('<Button-5>', self.__on_mousewheel)
+        self.__tree.bind('<Configure>', self.__on_tree_resize)
+        self.__tree.bind('<<TreeviewSelect>>', self.__on_select)
+        for key in ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'):
+            self.__tree.bind(key, self.__on_key)
         
         self.__tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        self.__scrollbar.pack(side='right', fill='y')
         
         parent.columnconfigure(0, weight=1)
         parent.columnconfigure(1, weight=2)
         parent.rowconfigure(0, weight=1)
+        
+        # Mapping key -> (card, getter total) dibuat sekali untuk __update_card
+        self.__cards = {
+            'pemasukan': (self.__pemasukan_frame, self.__calculator.hitung_total_pemasukan),
+            'pengeluaran': (self.__pengeluaran_frame, self.__calculator.hitung_total_pengeluaran),
+            'saldo': (self.__saldo_frame, self.__calculator.hitung_saldo)
+        }
     
     def __update_kategori_list(self):
         """Update kategori list - Private method"""
@@ -499,7 +755,7 @@ class MoneyTrackerApp:
     def __tambah_transaksi(self):
         """Tambah transaksi - Private method, menggunakan Factory Pattern"""
         try:
-            jumlah = float(self.__jumlah_entry.get())
+            jumlah = _ke_rupiah(float(self.__jumlah_entry.get()))
             if jumlah <= 0:
                 raise ValueError("Jumlah harus lebih dari 0")
             
@@ -512,20 +768,25 @@ class MoneyTrackerApp:
                 tipe, kategori, jumlah, keterangan
             )
             
-            self.__transaksi_list.append(transaksi)
+            # Simpan ke file lebih dulu (append satu baris, ditulis secara batch):
+            # jika encode gagal, list & calculator belum berubah
+            self.__data_manager.append_transaction(transaksi)
+            self.__mark_dirty()
             
-            # Update calculator dengan list baru
-            self.__calculator = FinancialCalculator(self.__transaksi_list)
+            self.__transaksi_list.append(transaksi)
             
-            # Simpan ke file
-            self.__data_manager.simpan_data(self.__transaksi_list)
+            # Update running totals di calculator
+            self.__calculator.add(transaksi)
             
             # Clear inputs
             self.__jumlah_entry.delete(0, tk.END)
             self.__keterangan_entry.delete(0, tk.END)
             
-            # Update display
-            self.__update_display()
+            # Update display secara incremental
+            self.__update_card(tipe)
+            self.__update_card('saldo')
+            self.__view_start = 0  # Tampilkan transaksi terbaru
+            self.__render_view()
             
             messagebox.showinfo("Sukses", "Transaksi berhasil ditambahkan! 🎉")
             
@@ -534,52 +795,170 @@ class MoneyTrackerApp:
     
     def __hapus_transaksi(self):
         """Hapus transaksi - Private method"""
-        selected = self.__tree.selection()
+        # Baris terpilih bisa saja sedang di luar jendela yang dirender
+        selected = self.__tree.selection() or (
+            (self.__terpilih,) if self.__terpilih is not None else ()
+        )
         if not selected:
             messagebox.showwarning("Peringatan", "Pilih transaksi yang ingin dihapus!")
             return
         
         if messagebox.askyesno("Konfirmasi", "Yakin ingin menghapus transaksi ini?"):
-            # Karena treeview menampilkan reversed, kita perlu konversi index
-            tree_index = self.__tree.index(selected[0])
-            # Index sebenarnya di list (karena reversed)
-            actual_index = len(self.__transaksi_list) - 1 - tree_index
+            # iid adalah index transaksi di list (lihat __render_view)
+            actual_index = int(selected[0])
+            transaksi = self.__transaksi_list[actual_index]
             
+            # Update running totals di calculator
+            self.__calculator.remove(transaksi)
             del self.__transaksi_list[actual_index]
+            self.__terpilih = None
             
-            # Update calculator
-            self.__calculator = FinancialCalculator(self.__transaksi_list)
-            
-            # Simpan ke file
-            self.__data_manager.simpan_data(self.__transaksi_list)
+            # Simpan ke file (catat tombstone, ditulis secara batch)
+            self.__data_manager.hapus_transaksi(actual_index, self.__transaksi_list)
+            self.__mark_dirty()
             
-            # Update display
-            self.__update_display()
+            # Update display secara incremental
+            self.__update_card(transaksi.tipe)
+            self.__update_card('saldo')
+            self.__render_view()
             messagebox.showinfo("Sukses", "Transaksi berhasil dihapus!")
     
-    def __update_display(self):
-        """Update display - Private method, demonstrasi Polymorphism"""
-        # Menggunakan calculator untuk mendapatkan statistik
-        stats = self.__calculator.get_statistik()
-        
-        # Update cards
-        self.__pemasukan_frame.label.config(text=f"Rp {stats['pemasukan']:,.0f}")
-        self.__pengeluaran_frame.label.config(text=f"Rp {stats['pengeluaran']:,.0f}")
-        self.__saldo_frame.label.config(text=f"Rp {stats['saldo']:,.0f}")
+    def __mark_dirty(self):
+        """Jadwalkan satu kali flush ke file untuk semua perubahan beruntun"""
+        if self.__save_scheduled is None:
+            self.__save_scheduled = self.__root.after(500, self.__flush)
+    
+    def __flush(self):
+        """Tulis perubahan yang tertunda ke file - Private method"""
+        self.__save_scheduled = None
+        self.__data_manager.flush()
+    
+    def __on_close(self):
+        """Pastikan perubahan tertunda tersimpan sebelum aplikasi ditutup"""
+        if self.__save_scheduled is not None:
+            self.__root.after_cancel(self.__save_scheduled)
+            self.__save_scheduled = None
+        self.__data_manager.flush()
+        self.__root.destroy()
+    
+    def __update_card(self, key):
+        """Update satu summary card dari running totals calculator - Private method"""
+        frame, hitung = self.__cards[key]
+        frame.label.config(text=f"Rp {hitung():,}")
+    
+    def __insert_row(self, transaksi, iid):
+        """Sisipkan satu baris transaksi ke treeview - demonstrasi Polymorphism"""
+        self.__tree.insert('', 'end', iid=iid, values=transaksi.get_row())
+    
+    def __render_view(self):
+        """Render hanya baris yang terlihat (virtualisasi Treeview)"""
+        total = len(self.__transaksi_list)
+        self.__view_start = max(0, min(self.__view_start, total - self.__baris_tampil))
+        end = min(self.__view_start + self.__baris_tampil, total)
+        
+        self.__tree.delete(*self.__tree.get_children())
+        # Urutan terbaru di atas: posisi tampilan pos -> index list total-1-pos
+        for pos in range(self.__view_start, end):
+            index = total - 1 - pos
+            self.__insert_row(self.__transaksi_list[index], str(index))
+        
+        # Pulihkan seleksi jika baris terpilih masih ada di jendela
+        if self.__terpilih is not None and self.__tree.exists(self.__terpilih):
+            self.__tree.selection_set(self.__terpilih)
+            self.__tree.focus(self.__terpilih)
+        
+        if total:
+            self.__scrollbar.set(self.__view_start / total, end / total)
+        else:
+            self.__scrollbar.set(0, 1)
         
-        # Update treeview - Demonstrasi Polymorphism
-        for item in self.__tree.get_children():
-            self.__tree.delete(item)
+        # Baris pertama yang dirender bisa dipakai untuk mengukur tinggi baris
+        if self.__ukur_baris():
+            self.__render_view()
+    
+    def __ukur_baris(self):
+        """Hitung jumlah baris yang muat dari tinggi Treeview sebenarnya.
+
+        Mengembalikan True jika jumlahnya berubah (perlu render ulang).
+        """
+        items = self.__tree.get_children()
+        bbox = self.__tree.bbox(items[0]) if items else ''
+        if not bbox:
+            return False  # Belum tampil di layar, belum bisa diukur
+        _, y, _, tinggi = bbox
+        baris = max(1, (self.__tree.winfo_height() - y) // tinggi)
+        if baris == self.__baris_tampil:
+            return False
+        self.__baris_tampil = baris
+        return True
+    
+    def __on_select(self, event):
+        """Catat baris terpilih agar bisa dipulihkan setelah render ulang"""
+        # Seleksi kosong diabaikan: render ulang mengosongkan Treeview sementara
+        selected = self.__tree.selection()
+        if selected:
+            self.__terpilih = selected[0]
+    
+    def __on_tree_resize(self, event):
+        """Callback <Configure>: sesuaikan jumlah baris dengan tinggi widget"""
+        if self.__ukur_baris():
+            self.__render_view()
+    
+    def __on_scroll(self, action, value, unit=None):
+        """Callback scrollbar: 'moveto' fraksi atau 'scroll' n units/pages"""
+        if action == 'moveto':
+            self.__view_start = int(float(value) * len(self.__transaksi_list))
+        elif action == 'scroll':
+            step = self.__baris_tampil if unit == 'pages' else 1
+            self.__view_start += int(value) * step
+        self.__render_view()
+    
+    def __on_mousewheel(self, event):
+        """Scroll dengan mouse wheel (Windows/macOS: delta, Linux: Button-4/5)"""
+        if event.num == 4 or event.delta > 0:
+            self.__on_scroll('scroll', -3, 'units')
+        else:
+            self.__on_scroll('scroll', 3, 'units')
+        return 'break'
+    
+    def __on_key(self, event):
+        """Navigasi keyboard ke seluruh riwayat, bukan hanya baris yang dirender"""
+        total = len(self.__transaksi_list)
+        if not total:
+            return 'break'
+        
+        # Posisi global (0 = terbaru) dari item yang sedang fokus
+        focus = self.__tree.focus()
+        pos = total - 1 - int(focus) if focus else self.__view_start
+        langkah = {
+            'Up': -1,
+            'Down': 1,
+            'Prior': -self.__baris_tampil,
+            'Next': self.__baris_tampil,
+            'Home': -total,
+            'End': total
+        }[event.keysym]
+        target = max(0, min(pos + langkah, total - 1))
+        
+        # Geser jendela hanya jika target di luar baris yang dirender
+        if target < self.__view_start:
+            self.__view_start = target
+            self.__render_view()
+        elif target >= self.__view_start + self.__baris_tampil:
+            self.__view_start = target - self.__baris_tampil + 1
+            self.__render_view()
+        
+        iid = str(total - 1 - target)
+        self.__tree.selection_set(iid)
+        self.__tree.focus(iid)
+        return 'break'
+    
+    def __update_display(self):
+        """Render awal seluruh display - Private method"""
+        for key in ('pemasukan', 'pengeluaran', 'saldo'):
+            self.__update_card(key)
         
-        for transaksi in reversed(self.__transaksi_list):
-            # Polymorphism: get_display_name() berbeda untuk Pemasukan dan Pengeluaran
-            self.__tree.insert('', 'end', values=(
-                transaksi.tanggal,
-                transaksi.get_display_name(),  # Method polymorphic
-                transaksi.kategori,
-                transaksi.format_currency(),
-                transaksi.keterangan
-            ))
+        self.__render_view()
 
 
 def main():